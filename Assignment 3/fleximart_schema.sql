@@ -38,3 +38,6 @@ CREATE TABLE order_items (
     FOREIGN KEY (product_id) REFERENCES products(product_id)
 );
 
+CREATE INDEX idx_orders_date ON orders (order_date, total_amount);
+CREATE INDEX idx_oi_order_prod ON order_items (order_id, product_id, subtotal, quantity);
+
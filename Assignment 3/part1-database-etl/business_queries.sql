@@ -7,26 +7,46 @@
 --
 -- Logic: Joining orders and order_items creates duplicates if you just COUNT(orders.order_id).
 -- Trap: You get the count of items, not orders.
--- Solution: Use COUNT(DISTINCT o.order_id) to get the true order count.
--- Note: Since we must join order_items per prompt, we use SUM(oi.subtotal) for total_spent.
--- If we didn't join order_items, we could use SUM(o.total_amount) instead.
+-- Solution: Sum order_items per order first (order_spend), so each order is one row
+-- when it is joined to orders and COUNT(*) is the true order count - no
+-- COUNT(DISTINCT) needed.
+-- Note: Since we must use order_items per prompt, total_spent is the sum of subtotals.
+-- If we didn't use order_items, we could use SUM(o.total_amount) instead.
+-- The HAVING filter runs before the customers lookup, so only qualifying customers are joined.
 
+WITH order_spend AS (
+    SELECT
+        order_id,
+        SUM(subtotal) AS order_total
+    FROM 
+        order_items
+    GROUP BY 
+        order_id
+),
+cust_agg AS (
+    SELECT
+        o.customer_id,
+        COUNT(*) AS total_orders,
+        SUM(os.order_total) AS total_spent
+    FROM 
+        orders o
+        INNER JOIN order_spend os ON o.order_id = os.order_id
+    GROUP BY 
+        o.customer_id
+    HAVING 
+        COUNT(*) >= 2 
+        AND SUM(os.order_total) > 5000
+)
 SELECT 
     CONCAT(c.first_name, ' ', c.last_name) AS customer_name,
     c.email,
-    COUNT(DISTINCT o.order_id) AS total_orders,
-    SUM(oi.subtotal) AS total_spent
+    ca.total_orders,
+    ca.total_spent
 FROM 
-    customers c
-    INNER JOIN orders o ON c.customer_id = o.customer_id
-    INNER JOIN order_items oi ON o.order_id = oi.order_id
-GROUP BY 
-    c.customer_id, c.first_name, c.last_name, c.email
-HAVING 
-    COUNT(DISTINCT o.order_id) >= 2 
-    AND SUM(oi.subtotal) > 5000
+    cust_agg ca
+    INNER JOIN customers c ON c.customer_id = ca.customer_id
 ORDER BY 
-    total_spent DESC;
+    ca.total_spent DESC;
 
 -- Query 2: Product Sales Analysis
 -- Business Question: For each product category, show the category name, 
@@ -35,21 +55,33 @@ ORDER BY
 -- Order by total revenue descending.
 -- Expected to return categories with >10000 revenue
 --
--- Logic: Simple aggregation. We group by category and sum up the subtotal from order_items.
+-- Logic: Sum quantity and subtotal per product first (product_sales), then group by category.
+-- Each sold product is one row after the first step, so COUNT(*) is the number of different
+-- products sold - no COUNT(DISTINCT) needed.
 -- Constraint: HAVING SUM(subtotal) > 10000.
 
+WITH product_sales AS (
+    SELECT
+        product_id,
+        SUM(quantity) AS quantity_sold,
+        SUM(subtotal) AS revenue
+    FROM 
+        order_items
+    GROUP BY 
+        product_id
+)
 SELECT 
     p.category,
-    COUNT(DISTINCT p.product_id) AS num_products,
-    SUM(oi.quantity) AS total_quantity_sold,
-    SUM(oi.subtotal) AS total_revenue
+    COUNT(*) AS num_products,
+    SUM(ps.quantity_sold) AS total_quantity_sold,
+    SUM(ps.revenue) AS total_revenue
 FROM 
-    products p
-    INNER JOIN order_items oi ON p.product_id = oi.product_id
+    product_sales ps
+    INNER JOIN products p ON p.product_id = ps.product_id
 GROUP BY 
     p.category
 HAVING 
-    SUM(oi.subtotal) > 10000
+    SUM(ps.revenue) > 10000
 ORDER BY 
     total_revenue DESC;
 
@@ -62,29 +94,29 @@ ORDER BY
 -- Logic: This requires a Window Function (SUM(...) OVER (ORDER BY ...)).
 -- Trap: Sorting by Month Name (January, February) alphabetically puts "April" first.
 -- Solution: We must group/sort by the Month Number (1, 2) but display the Month Name.
--- MySQL Syntax: Use MONTHNAME() for month name, MONTH() for month number, YEAR() for year.
+-- The name is taken once per group with MONTHNAME(MIN(order_date)) instead of
+-- formatting a month name for every order row.
+-- MySQL Syntax: Use MONTHNAME() for month name, MONTH() for month number.
+-- The year is filtered with a date range rather than YEAR(order_date) = 2024, so an
+-- index on order_date can be used for a range scan.
+-- The window is applied directly to the grouped SUM (SUM(SUM(...)) OVER), so the
+-- monthly totals and the running total come from a single grouped SELECT.
 
 SELECT 
-    month_name,
-    total_orders,
-    monthly_revenue,
-    SUM(monthly_revenue) OVER (
-        ORDER BY month_num
+    MONTHNAME(MIN(o.order_date)) AS month_name,
+    COUNT(DISTINCT o.order_id) AS total_orders,
+    SUM(o.total_amount) AS monthly_revenue,
+    SUM(SUM(o.total_amount)) OVER (
+        ORDER BY MONTH(o.order_date)
         ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
     ) AS cumulative_revenue
-FROM (
-    SELECT
-        MONTHNAME(o.order_date) AS month_name,
-        MONTH(o.order_date) AS month_num,
-        COUNT(DISTINCT o.order_id) AS total_orders,
-        SUM(o.total_amount) AS monthly_revenue
-    FROM 
-        orders o
-    WHERE 
-        YEAR(o.order_date) = 2024
-    GROUP BY 
-        MONTH(o.order_date), MONTHNAME(o.order_date)
-) AS monthly_data
+FROM 
+    orders o
+WHERE 
+    o.order_date >= '2024-01-01'
+    AND o.order_date < '2025-01-01'
+GROUP BY 
+    MONTH(o.order_date)
 ORDER BY 
-    month_num;
+    MONTH(o.order_date);
 
@@ -13,9 +13,12 @@ import pandas as pd
 import mysql.connector
 from mysql.connector import Error
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import numpy as np
 import sys
 import os
+import tempfile
 from getpass import getpass
 
 # ==============================
@@ -30,16 +33,54 @@ def get_db_config():
     if password is None:
         password = getpass("Enter MySQL password: ")
     
-    return {
+    config = {
         "host": os.getenv('MYSQL_HOST', 'localhost'),      # Database server address
         "database": os.getenv('MYSQL_DATABASE', 'fleximart'),  # Database name
         "user": os.getenv('MYSQL_USER', 'root'),           # MySQL username
         "password": password,                              # MySQL password (from env or prompt)
-        "port": int(os.getenv('MYSQL_PORT', '3306'))      # MySQL port (default is 3306)
+        "port": int(os.getenv('MYSQL_PORT', '3306')),     # MySQL port (default is 3306)
+        "allow_local_infile_in_path": tempfile.gettempdir()  # LOAD DATA LOCAL INFILE only from the temp directory
     }
+    
+    # Use the C extension for faster row encoding, but only when it can be
+    # loaded - passing use_pure=False without it makes connect() fail instead
+    # of falling back to the pure Python implementation
+    if mysql.connector.HAVE_CEXT:
+        config["use_pure"] = False
+    
+    return config
+
+def get_batch_size():
+    """
+    Read the INSERT batch size from ETL_BATCH_SIZE (default 10,000 rows).
+    
+    Raises:
+        ValueError: If ETL_BATCH_SIZE is not a whole number of at least 1
+    """
+    value = os.getenv('ETL_BATCH_SIZE', '10000')
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise ValueError(f"ETL_BATCH_SIZE must be a positive integer, got {value!r}")
+    return size
+
+# Number of rows sent to MySQL in one multi-row INSERT statement
+# Can be lowered with ETL_BATCH_SIZE if a batch exceeds the server's max_allowed_packet
+# Validated before the password prompt so a bad value fails straight away
+BATCH_SIZE = get_batch_size()
 
 DB_CONFIG = get_db_config()
 
+# Number of CSV rows read and transformed at a time by streaming loaders
+CSV_CHUNK_SIZE = 50_000
+
+# Source CSV files, in the order they appear in the data quality report
+CUSTOMERS_FILE = "../data/customers_raw.csv"
+PRODUCTS_FILE = "../data/products_raw.csv"
+SALES_FILE = "../data/sales_raw.csv"
+
 # ==============================
 # DATA QUALITY METRICS TRACKER
 # ==============================
@@ -55,6 +96,10 @@ class DataQualityMetrics:
         # Dictionary to track reasons for dropping records
         self.drop_reasons = defaultdict(lambda: defaultdict(int))
 
+    def register(self, file):
+        """Add a file to the report before any of its metrics are tracked"""
+        self.metrics[file]
+    
     def read(self, file, n): 
         """Track number of records read from a file"""
         self.metrics[file]["records_read"] += n
@@ -83,46 +128,45 @@ METRICS = DataQualityMetrics()
 # HELPER FUNCTIONS
 # ==============================
 
-def get_connection():
+def get_connection(use_database=True):
     """
     Create and return a connection to the MySQL database.
     This function uses the DB_CONFIG settings to establish the connection.
+    
+    Args:
+        use_database: If False, connect to the server without selecting the
+            database (needed before the database has been created)
     """
-    return mysql.connector.connect(**DB_CONFIG)
+    if use_database:
+        return mysql.connector.connect(**DB_CONFIG)
+    config = {key: value for key, value in DB_CONFIG.items() if key != "database"}
+    return mysql.connector.connect(**config)
 
-def create_database_schema():
+def create_database_schema(conn):
     """
     Create the database and all required tables if they don't exist.
     
     This function:
-    1. Creates the database if it doesn't exist
+    1. Creates the database if it doesn't exist and selects it on `conn`
     2. Creates all tables (customers, products, orders, order_items) with their schemas
     3. Sets up foreign key relationships
+    4. Creates the covering indexes used by the business queries
     
     This makes the pipeline self-contained - it builds its own infrastructure
     before running the ETL process.
+    
+    Args:
+        conn: Server connection, opened with get_connection(use_database=False)
     """
     print("Creating database schema...")
     
-    # First, connect without specifying database to create it if needed
-    conn_no_db = mysql.connector.connect(
-        host=DB_CONFIG["host"],
-        user=DB_CONFIG["user"],
-        password=DB_CONFIG["password"],
-        port=DB_CONFIG["port"]
-    )
-    cur_no_db = conn_no_db.cursor()
-    
-    # Create database if it doesn't exist
-    cur_no_db.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-    conn_no_db.commit()
-    cur_no_db.close()
-    conn_no_db.close()
-    
-    # Now connect to the database to create tables
-    conn = get_connection()
     cur = conn.cursor()
     
+    # Create database if it doesn't exist, then switch this connection to it
+    cur.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+    conn.commit()
+    conn.database = DB_CONFIG['database']
+    
     # SQL schema statements - using exact schema as specified (without IF NOT EXISTS for file)
     schema_statements_file = [
         "-- Database: fleximart\n",
@@ -164,6 +208,9 @@ def create_database_schema():
         "    FOREIGN KEY (order_id) REFERENCES orders(order_id),\n",
         "    FOREIGN KEY (product_id) REFERENCES products(product_id)\n",
         ");\n",
+        "\n",
+        "CREATE INDEX idx_orders_date ON orders (order_date, total_amount);\n",
+        "CREATE INDEX idx_oi_order_prod ON order_items (order_id, product_id, subtotal, quantity);\n",
         "\n"
     ]
     
@@ -213,6 +260,15 @@ def create_database_schema():
         """
     ]
     
+    # Covering indexes for the business queries: (table, index name, columns)
+    # The payload columns are part of the key so the queries can be answered
+    # from the index alone. orders.customer_id needs no extra index: the one
+    # InnoDB creates for its foreign key already ends with the primary key.
+    index_definitions = [
+        ("orders", "idx_orders_date", "order_date, total_amount"),
+        ("order_items", "idx_oi_order_prod", "order_id, product_id, subtotal, quantity"),
+    ]
+    
     # Execute each CREATE TABLE statement
     for statement in schema_statements_exec:
         try:
@@ -222,29 +278,364 @@ def create_database_schema():
             print(f"Error creating table: {e}")
             raise
     
+    # MySQL has no CREATE INDEX IF NOT EXISTS, so only create the indexes
+    # that are not already present
+    cur.execute(
+        "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %s",
+        (DB_CONFIG['database'],)
+    )
+    existing_indexes = {name for (name,) in cur.fetchall()}
+    for table, index_name, columns in index_definitions:
+        if index_name in existing_indexes:
+            continue
+        try:
+            cur.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+        except Error as e:
+            print(f"Error creating index: {e}")
+            raise
+    
     # Write schema to SQL file
+    # Skip the write when the file already holds exactly this schema
     sql_filename = "fleximart_schema.sql"
-    with open(sql_filename, "w") as f:
-        f.writelines(schema_statements_file)
+    schema_text = "".join(schema_statements_file)
+    existing_text = None
+    if os.path.exists(sql_filename):
+        with open(sql_filename) as f:
+            existing_text = f.read()
+    if existing_text != schema_text:
+        with open(sql_filename, "w") as f:
+            f.write(schema_text)
     
     cur.close()
-    conn.close()
     print(f"Database schema created successfully.")
-    print(f"Schema exported to {sql_filename}")
+    if existing_text != schema_text:
+        print(f"Schema exported to {sql_filename}")
+    else:
+        print(f"Schema file {sql_filename} is already up to date")
+
+def start_bulk_load(conn):
+    """
+    Prepare a connection for loading all tables in one transaction.
+    
+    Foreign key checks are switched off for the session, so the server does
+    not look up the parent row for every inserted order and order item, and
+    autocommit is disabled so all phases are committed together by
+    finish_bulk_load(). Unique checks stay on: customers.email is the only
+    secondary unique key, and duplicate detection on it is required.
+    
+    Args:
+        conn: Database connection used for the whole load
+    """
+    cur = conn.cursor()
+    cur.execute("SET foreign_key_checks = 0")
+    cur.close()
+    conn.autocommit = False
+    conn.start_transaction()
 
-def safe_value(val):
+def find_orphan_rows(cur):
     """
-    Convert NaN/NaT values to None for database insertion.
+    Count rows that reference a missing parent row.
+    
+    Used to verify referential integrity once after a load that ran with
+    foreign key checks switched off.
     
     Args:
-        val: Value that might be NaN, NaT, or a valid value
+        cur: Database cursor
     
     Returns:
-        None if value is NaN/NaT, otherwise the original value
+        Dictionary mapping each foreign key (e.g., 'orders.customer_id') to the
+        number of rows with a missing parent; only non-zero counts are included
     """
-    if pd.isna(val):
-        return None
-    return val
+    checks = {
+        "orders.customer_id": """
+            SELECT COUNT(*) FROM orders o
+            LEFT JOIN customers c ON o.customer_id = c.customer_id
+            WHERE c.customer_id IS NULL
+        """,
+        "order_items.order_id": """
+            SELECT COUNT(*) FROM order_items oi
+            LEFT JOIN orders o ON oi.order_id = o.order_id
+            WHERE o.order_id IS NULL
+        """,
+        "order_items.product_id": """
+            SELECT COUNT(*) FROM order_items oi
+            LEFT JOIN products p ON oi.product_id = p.product_id
+            WHERE p.product_id IS NULL
+        """
+    }
+    orphans = {}
+    for foreign_key, query in checks.items():
+        cur.execute(query)
+        count = cur.fetchone()[0]
+        if count:
+            orphans[foreign_key] = count
+    return orphans
+
+def finish_bulk_load(conn):
+    """
+    Verify foreign keys, restore session settings and commit the load.
+    
+    If any row references a missing parent, the whole load is rolled back.
+    
+    Args:
+        conn: Database connection prepared with start_bulk_load()
+    
+    Raises:
+        RuntimeError: If the loaded data violates a foreign key
+    """
+    cur = conn.cursor()
+    orphans = find_orphan_rows(cur)
+    if orphans:
+        conn.rollback()
+    cur.execute("SET foreign_key_checks = 1")
+    cur.close()
+    if orphans:
+        raise RuntimeError(f"Foreign key check failed, load rolled back: {orphans}")
+    
+    # Save all changes to database
+    conn.commit()
+
+def batched(rows, size=BATCH_SIZE):
+    """
+    Split an iterable of row tuples into lists of at most `size` rows.
+    
+    Args:
+        rows: Iterable of row tuples
+        size: Maximum number of rows per batch
+    
+    Yields:
+        Lists of row tuples, each holding at most `size` rows
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def insert_batch(cur, table, id_column, insert_query, rows):
+    """
+    Insert a batch of rows with one multi-row INSERT and return their new IDs.
+    
+    mysql-connector rewrites executemany() on an INSERT ... VALUES statement into
+    a single multi-row INSERT, so the whole batch costs one round trip. A multi-row
+    INSERT is a "simple insert" for InnoDB, so the AUTO_INCREMENT values it generates
+    are consecutive and lastrowid holds the ID of the first row.
+    
+    The rewrite only happens when every value is a %s placeholder, so literal
+    values must be passed as parameters too. If the connector ran the rows one
+    at a time instead, lastrowid would be the ID of the last row and every
+    mapped ID would be shifted, so the result is checked against MAX(id_column).
+    
+    Args:
+        cur: Database cursor
+        table: Table name
+        id_column: AUTO_INCREMENT primary key column of `table`
+        insert_query: INSERT statement with %s placeholders for one row
+        rows: List of row tuples
+    
+    Returns:
+        List of auto-generated IDs, in the same order as `rows`
+    
+    Raises:
+        RuntimeError: If the rows were not inserted as one multi-row INSERT
+    """
+    cur.executemany(insert_query, rows)
+    if cur.rowcount != len(rows):
+        raise RuntimeError(f"Expected {len(rows)} rows inserted into {table}, got {cur.rowcount}")
+    first_id = cur.lastrowid
+    last_id = first_id + len(rows) - 1
+    if get_max_id(cur, table, id_column) != last_id:
+        raise RuntimeError(f"Rows inserted into {table} did not get consecutive IDs from {first_id}")
+    return list(range(first_id, last_id + 1))
+
+def insert_with_ids(cur, table, id_column, insert_query, keys, rows):
+    """
+    Insert rows in batches and map each source key to its new database ID.
+    
+    Args:
+        cur: Database cursor
+        table: Table name
+        id_column: AUTO_INCREMENT primary key column of `table`
+        insert_query: INSERT statement with %s placeholders for one row
+        keys: List of source IDs (e.g., 'P001'), one per row
+        rows: List of row tuples, in the same order as `keys`
+    
+    Returns:
+        Dictionary mapping each source ID to its auto-generated database ID
+    """
+    id_map = {}
+    for key_batch, batch in zip(batched(keys), batched(rows)):
+        id_map.update(zip(key_batch, insert_batch(cur, table, id_column, insert_query, batch)))
+    return id_map
+
+def local_infile_enabled(cur):
+    """Check whether the server allows LOAD DATA LOCAL INFILE."""
+    cur.execute("SELECT @@GLOBAL.local_infile")
+    return bool(cur.fetchone()[0])
+
+def can_load_data(cur, table):
+    """
+    Check whether `table` should be bulk loaded with LOAD DATA LOCAL INFILE.
+    
+    For tables with unique business keys (customers, products) LOAD DATA is
+    only used for first-time loads: the server must allow local infile and the
+    table must be empty. Otherwise the loaders fall back to batched INSERT
+    statements.
+    
+    Args:
+        cur: Database cursor
+        table: Table name
+    
+    Returns:
+        True if LOAD DATA LOCAL INFILE should be used for this table
+    """
+    if not local_infile_enabled(cur):
+        return False
+    cur.execute(f"SELECT 1 FROM {table} LIMIT 1")
+    return cur.fetchone() is None
+
+def write_load_data_file(df, path):
+    """
+    Write DataFrame rows to a file in the default LOAD DATA text format.
+    
+    Fields are tab-separated and rows newline-terminated. Backslashes, tabs
+    and line breaks inside values are escaped, and missing values are written
+    as \\N so they load as NULL.
+    
+    Args:
+        df: DataFrame holding exactly the columns to load, in table column order
+        path: Output file path
+    """
+    fields = []
+    for column in df.columns:
+        values = df[column]
+        text = (
+            values.astype(str)
+            .str.replace('\\', '\\\\', regex=False)
+            .str.replace('\t', '\\t', regex=False)
+            .str.replace('\n', '\\n', regex=False)
+            .str.replace('\r', '\\r', regex=False)
+        )
+        fields.append(text.where(values.notna(), '\\N'))
+    
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if len(df):
+            lines = fields[0].str.cat(fields[1:], sep='\t')
+            f.write('\n'.join(lines) + '\n')
+
+def check_load_warnings(cur, table):
+    """
+    Fail a LOAD DATA LOCAL INFILE that produced warnings.
+    
+    LOAD DATA LOCAL implies IGNORE, so data errors that make an INSERT fail in
+    strict mode (NULL in a NOT NULL column, values too long for a column,
+    duplicate keys) only raise warnings and the rows are coerced or skipped.
+    Treating those warnings as errors keeps the loaded data the same as on the
+    INSERT path. Notes are informational (an INSERT would accept the same
+    value) and are ignored.
+    
+    Args:
+        cur: Database cursor that just ran the LOAD DATA statement
+        table: Table name (for the error message)
+    
+    Raises:
+        RuntimeError: If the load produced any warnings or errors
+    """
+    if not cur.warning_count:
+        return
+    cur.execute("SHOW WARNINGS")
+    messages = [message for level, _, message in cur.fetchall() if level != 'Note']
+    if messages:
+        raise RuntimeError(
+            f"LOAD DATA into {table} produced {len(messages)} warning(s): {messages[:5]}"
+        )
+
+def load_data_infile(cur, table, df):
+    """
+    Bulk load DataFrame rows into `table` with LOAD DATA LOCAL INFILE.
+    
+    The rows are written to a temporary file, which the server reads in one
+    streamed request instead of parsing one INSERT per batch.
+    
+    Args:
+        cur: Database cursor
+        table: Table name
+        df: DataFrame whose columns match the table columns to load
+    
+    Returns:
+        Number of rows loaded
+    
+    Raises:
+        RuntimeError: If the server coerced or skipped any row (see check_load_warnings)
+    """
+    with tempfile.NamedTemporaryFile(suffix=".tsv", delete=False) as f:
+        path = f.name
+    try:
+        write_load_data_file(df, path)
+        cur.execute(f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t'
+            LINES TERMINATED BY '\\n'
+            ({', '.join(df.columns)})
+        """, (path,))
+        loaded = cur.rowcount
+        check_load_warnings(cur, table)
+        return loaded
+    finally:
+        os.remove(path)
+
+def get_max_id(cur, table, id_column):
+    """Return the highest ID currently in `table` (0 if the table is empty)."""
+    cur.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}")
+    return cur.fetchone()[0]
+
+def load_data_with_ids(cur, table, id_column, keys, df):
+    """
+    Bulk load rows with LOAD DATA and map each source key to its new database ID.
+    
+    LOAD DATA inserts rows in file order, so the IDs created above the previous
+    maximum belong to the loaded rows, in the same order.
+    
+    Args:
+        cur: Database cursor
+        table: Table name
+        id_column: AUTO_INCREMENT primary key column of `table`
+        keys: List of source IDs (e.g., 'P001'), one per row
+        df: DataFrame whose columns match the table columns to load
+    
+    Returns:
+        Dictionary mapping each source ID to its auto-generated database ID
+    """
+    last_id = get_max_id(cur, table, id_column)
+    load_data_infile(cur, table, df)
+    cur.execute(
+        f"SELECT {id_column} FROM {table} WHERE {id_column} > %s ORDER BY {id_column}",
+        (last_id,)
+    )
+    new_ids = [row[0] for row in cur.fetchall()]
+    if len(new_ids) != len(keys):
+        raise RuntimeError(f"Expected {len(keys)} new rows in {table}, found {len(new_ids)}")
+    return dict(zip(keys, new_ids))
+
+def to_db_rows(df, columns):
+    """
+    Convert DataFrame columns to a list of rows for database insertion.
+    
+    The whole frame is converted to plain Python values in one pass, with
+    NaN/NA replaced by None, so no per-cell conversion is needed while the
+    rows are inserted.
+    
+    Args:
+        df: DataFrame holding the columns
+        columns: List of column names, in insert order
+    
+    Returns:
+        List of rows (lists of values in the order of `columns`)
+    """
+    values = df[columns].astype(object)
+    return values.where(df[columns].notna(), None).to_numpy().tolist()
 
 def clean_date_series(series):
     """
@@ -253,34 +644,32 @@ def clean_date_series(series):
     Strategy: 
     1. Try ISO (YYYY-MM-DD) first (Most common)
     2. Try Day-First (DD/MM/YYYY) for remaining NaTs
-    3. Try Month-First (MM-DD-YYYY) for remaining NaTs
+    3. Try Month-First (MM-DD-YYYY, MM/DD/YYYY) for remaining NaTs
     
     This approach minimizes data loss by trying multiple common formats
-    before giving up on a date value.
+    before giving up on a date value. Fallback formats are only tried
+    while unparsed values remain.
     
     Args:
         series: pandas Series containing date strings in various formats
     
     Returns:
-        pandas Series with date objects (YYYY-MM-DD format) or NaT for unparseable dates
+        pandas Series of datetime64 values (no time component) or NaT for unparseable dates
     """
     # 1. Try standard YYYY-MM-DD first (most common format)
     dates = pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
     
-    # 2. Fill NaTs with DD/MM/YYYY (e.g., 15/01/2024, common in Indian/UK format)
-    mask = dates.isna()
-    dates[mask] = pd.to_datetime(series[mask], format='%d/%m/%Y', errors='coerce')
-    
-    # 3. Fill remaining NaTs with MM-DD-YYYY (e.g., 01-22-2024, US format)
-    mask = dates.isna()
-    dates[mask] = pd.to_datetime(series[mask], format='%m-%d-%Y', errors='coerce')
+    # 2-4. Fill remaining NaTs with the fallback formats, in order:
+    #   DD/MM/YYYY (e.g., 15/01/2024, common in Indian/UK format)
+    #   MM-DD-YYYY (e.g., 01-22-2024, US format)
+    #   MM/DD/YYYY
+    for fmt in ('%d/%m/%Y', '%m-%d-%Y', '%m/%d/%Y'):
+        mask = dates.isna() & series.notna()
+        if not mask.any():
+            break
+        dates[mask] = pd.to_datetime(series[mask], format=fmt, errors='coerce')
     
-    # 4. Try MM/DD/YYYY format as well
-    mask = dates.isna()
-    dates[mask] = pd.to_datetime(series[mask], format='%m/%d/%Y', errors='coerce')
-    
-    # Final cleanup: Ensure everything is proper date object (removes time component)
-    return dates.dt.date
+    return dates
 
 def clean_phone(phone):
     """
@@ -310,47 +699,102 @@ def clean_phone(phone):
         pass
     return None
 
+def clean_phone_series(series):
+    """
+    Vectorized version of clean_phone() for a whole pandas Series.
+    
+    Applies the same rules as clean_phone() (numeric conversion, last 10 digits,
+    +91- prefix), but uses pandas string operations over the whole column
+    instead of calling a Python function once per row.
+    
+    Args:
+        series: pandas Series of raw phone numbers
+    
+    Returns:
+        pandas Series of standardized phone numbers (e.g., "+91-9876543210"),
+        with None where the number is missing or invalid
+    """
+    # Convert to numbers, handling scientific notation; invalid values become NaN
+    numbers = pd.to_numeric(series, errors='coerce').astype('float64')
+    
+    # Infinite values are invalid, and values that do not fit in int64 cannot be
+    # cast below; those rare large numbers go through clean_phone() instead
+    finite = np.isfinite(numbers)
+    in_range = finite & (numbers.abs() < 1e18)
+    digits = numbers[in_range].astype('int64').astype(str)
+    
+    # Keep numbers with at least 10 digits and format the last 10 as +91-XXXXXXXXXX
+    digits = digits[digits.str.len() >= 10]
+    phones = "+91-" + digits.str.slice(-10)
+    out_of_range = series[finite & ~in_range]
+    if len(out_of_range):
+        phones = pd.concat([phones, out_of_range.astype(object).map(clean_phone).dropna()])
+    
+    # Re-align with the original index; missing/invalid numbers become None
+    phones = phones.reindex(series.index)
+    return phones.astype(object).where(phones.notna(), None)
+
 
 # ==============================
 # 1. CUSTOMERS DATA PROCESSING
 # ==============================
-def process_customers():
+def clean_customers():
     """
-    Extract, transform, and load customer data from CSV file.
+    Extract and transform customer data from CSV file.
+    
+    This step does not use the database, so it can run on a worker thread
+    while another table is being loaded.
     
     Steps:
     1. Read customer data from CSV file
-    2. Remove duplicate records (based on email)
-    3. Drop records with missing email addresses (required field)
+    2. Drop records with missing email addresses (required field)
+    3. Remove duplicate records (based on email)
     4. Standardize phone numbers and dates
-    5. Load data into database and create ID mapping
     
     Returns:
-        Dictionary mapping old customer IDs (from CSV) to new database IDs
-        Example: {'C001': 1, 'C002': 2, ...}
+        DataFrame of cleaned customer records, ready for load_customers()
     """
-    file = "../data/customers_raw.csv"
+    file = CUSTOMERS_FILE
     print(f"Processing {file}...")
     
     # Step 1: Extract - Read data from CSV file
-    df = pd.read_csv(file)
+    # Explicit dtypes skip pandas' type inference; all columns are read as text
+    # and parsed by the cleaning steps below
+    # Text columns are stored in Arrow buffers so .str operations run in C++
+    df = pd.read_csv(
+        file,
+        usecols=['customer_id', 'first_name', 'last_name', 'email', 'phone', 'city', 'registration_date'],
+        dtype={
+            'customer_id': 'string[pyarrow]',
+            'first_name': 'string[pyarrow]',
+            'last_name': 'string[pyarrow]',
+            'email': 'string[pyarrow]',
+            'phone': 'string[pyarrow]',
+            'city': 'string[pyarrow]',
+            'registration_date': 'string[pyarrow]'
+        },
+        memory_map=True
+    )
     METRICS.read(file, len(df))
 
-    # Step 2: Transform - Remove duplicate records
+    # Step 2: Transform - Handle missing values
+    # Email is a required field, so drop records with missing emails
+    # This runs before duplicate removal so dropped rows are never hashed,
+    # and missing emails are not counted as duplicates of each other
+    before = len(df)
+    df = df.dropna(subset=['email'])
+    METRICS.dropped(file, "missing_email", before - len(df))
+
+    # Step 3: Transform - Remove duplicate records
     # Keep the first occurrence when duplicate emails are found
+    # Emails are compared case-insensitively, like the unique key on customers.email
     before = len(df)
-    df = df.drop_duplicates(subset=['email'], keep='first')
+    df = df[~df['email'].str.lower().duplicated(keep='first')]
     METRICS.dup(file, before - len(df))
 
-    # Step 3: Transform - Handle missing values
-    # Email is a required field, so drop records with missing emails
-    missing = df['email'].isna()
-    METRICS.dropped(file, "missing_email", missing.sum())
-    df = df[~missing]
-
     # Step 4: Transform - Standardize data formats
     # Convert phone numbers to +91-XXXXXXXXXX format
-    df['phone'] = df['phone'].apply(clean_phone)
+    df['phone'] = clean_phone_series(df['phone'])
     
     # Convert dates to YYYY-MM-DD format using robust multi-format parsing
     # Note: registration_date is nullable in schema, so NULL is acceptable for invalid dates
@@ -358,10 +802,9 @@ def process_customers():
     # (The row is still loaded, but with NULL date - this is compliant with schema)
     date_series = clean_date_series(df['registration_date'])
     
-    # Convert date objects to YYYY-MM-DD strings for database storage (vectorized)
-    # Python date objects convert to YYYY-MM-DD format when converted to string
+    # Convert dates to YYYY-MM-DD strings for database storage (vectorized)
     # Replace NaT (unparseable dates) with None for database compatibility
-    df['registration_date'] = date_series.apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None)
+    df['registration_date'] = date_series.dt.strftime('%Y-%m-%d').astype(object).where(date_series.notna(), None)
     
     # Track missing/invalid dates - these are stored as NULL (not dropped)
     # This is counted as "missing values handled" in the report
@@ -370,62 +813,83 @@ def process_customers():
         # Count as missing values handled (stored as NULL, not dropped)
         METRICS.filled(file, invalid_dates)
 
+    return df
+
+def load_customers(conn, df):
+    """
+    Load cleaned customer records into the database and create the ID mapping.
+    
+    Args:
+        conn: Database connection prepared with start_bulk_load()
+        df: DataFrame returned by clean_customers()
+    
+    Returns:
+        Dictionary mapping old customer IDs (from CSV) to new database IDs
+        Example: {'C001': 1, 'C002': 2, ...}
+    """
+    file = CUSTOMERS_FILE
+    
     # Step 5: Load - Insert data into database
-    conn = get_connection()
     cur = conn.cursor()
     
     # Create mapping: old CSV ID (e.g., 'C001') -> new database ID (e.g., 1)
     # This mapping is needed to link sales records to customers later
     id_map = {} 
     
+    columns = ['first_name', 'last_name', 'email', 'phone', 'city', 'registration_date']
+    
+    # First-time load: stream all rows with LOAD DATA, then read the new IDs back
+    # by email (the unique key; compared case-insensitively like the column)
+    if can_load_data(cur, 'customers'):
+        last_id = get_max_id(cur, 'customers', 'customer_id')
+        METRICS.loaded(file, load_data_infile(cur, 'customers', df[columns]))
+        cur.execute("SELECT customer_id, email FROM customers WHERE customer_id > %s", (last_id,))
+        email_ids = {email.lower(): customer_id for customer_id, email in cur.fetchall()}
+        db_ids = df['email'].str.lower().map(email_ids).dropna()
+        id_map = dict(zip(df.loc[db_ids.index, 'customer_id'], db_ids.astype('int64').tolist()))
+        cur.close()
+        return id_map
+    
+    # Existing customers (same email) are left unchanged instead of raising
+    # a duplicate-key error, so every batch goes through as one statement
     insert_query = """
         INSERT INTO customers (first_name, last_name, email, phone, city, registration_date)
         VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE customer_id = customer_id
     """
     
-    # Process each customer record
-    for _, row in df.iterrows():
-        try:
-            # Insert customer into database
-            # Convert NaN values to None for database compatibility
-            cur.execute(insert_query, (
-                safe_value(row['first_name']), 
-                safe_value(row['last_name']), 
-                safe_value(row['email']), 
-                safe_value(row['phone']), 
-                safe_value(row['city']), 
-                safe_value(row['registration_date'])
-            ))
-            # Get the auto-generated ID from database
-            new_id = cur.lastrowid
-            # Track the metric - if execute() succeeded without exception, the record was loaded
-            METRICS.loaded(file, 1)
-            # Store mapping: old CSV ID -> new database ID (if we got a valid ID)
-            if new_id:
-                id_map[row['customer_id']] = new_id
-        except Error as e:
-            # Handle duplicate email (if record already exists in database)
-            if 'Duplicate entry' in str(e) and 'email' in str(e):
-                # Fetch the existing customer's ID
-                cur.execute("SELECT customer_id FROM customers WHERE email = %s", (row['email'],))
-                result = cur.fetchone()
-                if result:
-                    # Use existing ID for the mapping
-                    id_map[row['customer_id']] = result[0]
-            else:
-                print(f"Error loading customer {row['email']}: {e}")
-            continue
+    # Build insert tuples up front so they can be sent in batches
+    # Convert NaN values to None for database compatibility
+    # Emails are lower-cased once for the whole frame to match the read-back IDs
+    customer_ids = df['customer_id'].tolist()
+    emails = df['email'].tolist()
+    email_keys = df['email'].str.lower().tolist()
+    rows = to_db_rows(df, columns)
+    
+    for id_batch, email_batch, key_batch, batch in zip(
+            batched(customer_ids), batched(emails), batched(email_keys), batched(rows)):
+        last_id = get_max_id(cur, 'customers', 'customer_id')
+        cur.executemany(insert_query, batch)
+        
+        # Read back the IDs of new and existing customers in one round trip
+        placeholders = ", ".join(["%s"] * len(email_batch))
+        cur.execute(f"SELECT customer_id, email FROM customers WHERE email IN ({placeholders})", email_batch)
+        email_ids = {email.lower(): db_id for db_id, email in cur.fetchall()}
+        
+        # Only customers created by this batch count as loaded
+        METRICS.loaded(file, sum(db_id > last_id for db_id in email_ids.values()))
+        # Store mapping: old CSV ID -> new (or existing) database ID
+        for customer_id, email_key in zip(id_batch, key_batch):
+            if email_key in email_ids:
+                id_map[customer_id] = email_ids[email_key]
 
-    # Save all changes to database
-    conn.commit()
     cur.close()
-    conn.close()
     return id_map
 
 # ==============================
 # 2. PRODUCTS DATA PROCESSING
 # ==============================
-def process_products():
+def process_products(conn):
     """
     Extract, transform, and load product data from CSV file.
     
@@ -437,79 +901,113 @@ def process_products():
     5. Drop records with missing prices (required field)
     6. Load data into database and create ID mapping
     
+    Args:
+        conn: Database connection prepared with start_bulk_load()
+    
     Returns:
         Dictionary mapping old product IDs (from CSV) to new database IDs
         Example: {'P001': 1, 'P002': 2, ...}
     """
-    file = "../data/products_raw.csv"
+    file = PRODUCTS_FILE
     print(f"Processing {file}...")
     
-    # Step 1: Extract - Read data from CSV file
-    df = pd.read_csv(file)
-    METRICS.read(file, len(df))
-
-    # Step 2: Transform - Remove duplicate records
-    # Keep the first occurrence when duplicate product_ids are found
-    before = len(df)
-    df = df.drop_duplicates(subset=['product_id'], keep='first')
-    METRICS.dup(file, before - len(df))
-
-    # Step 3: Transform - Standardize category names
-    # Convert to Title Case: "electronics" -> "Electronics", "FASHION" -> "Fashion"
-    df['category'] = df['category'].astype(str).str.title()
-
-    # Step 4: Transform - Handle missing stock quantities
-    # Fill missing stock with 0 (default value)
-    null_stock = df['stock_quantity'].isna().sum()
-    df['stock_quantity'] = df['stock_quantity'].fillna(0)
-    METRICS.filled(file, null_stock)
-
-    # Step 5: Transform - Handle missing prices
-    # Price is a required field, so drop records with missing prices
-    # (We don't guess prices as per business rule)
-    missing_price = df['price'].isna()
-    METRICS.dropped(file, "missing_price", missing_price.sum())
-    df = df[~missing_price]
-
-    # Step 6: Load - Insert data into database
-    conn = get_connection()
     cur = conn.cursor()
     
     # Create mapping: old CSV ID (e.g., 'P001') -> new database ID (e.g., 1)
     # This mapping is needed to link sales records to products later
     id_map = {}
+    # Product IDs kept so far, used to drop duplicates that span chunks
+    seen_ids = set()
 
     insert_query = """
         INSERT INTO products (product_name, category, price, stock_quantity)
         VALUES (%s, %s, %s, %s)
     """
+    columns = ['product_name', 'category', 'price', 'stock_quantity']
+    
+    # First-time loads use LOAD DATA LOCAL INFILE instead of INSERT statements
+    use_load_data = can_load_data(cur, 'products')
 
-    # Process each product record
-    for _, row in df.iterrows():
-        # Insert product into database
-        # Convert NaN values to None for database compatibility
-        cur.execute(insert_query, (
-            safe_value(row['product_name']), 
-            safe_value(row['category']), 
-            safe_value(row['price']), 
-            safe_value(row['stock_quantity'])
-        ))
-        # Get the auto-generated ID from database
-        new_id = cur.lastrowid
-        # Store mapping: old CSV ID -> new database ID
-        id_map[row['product_id']] = new_id
-        METRICS.loaded(file, 1)
+    # The file is read and transformed in chunks. While the writer thread inserts
+    # one chunk, the main thread parses and cleans the next one
+    # Text columns are stored in Arrow buffers so .str operations run in C++
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as writer, \
+            pd.read_csv(
+                file,
+                usecols=['product_id', 'product_name', 'category', 'price', 'stock_quantity'],
+                dtype={
+                    'product_id': 'string[pyarrow]',
+                    'product_name': 'string[pyarrow]',
+                    'category': 'string[pyarrow]',
+                    'price': 'float64',
+                    'stock_quantity': 'Int64'
+                },
+                memory_map=True,
+                chunksize=CSV_CHUNK_SIZE
+            ) as reader:
+        for df in reader:
+            # Step 1: Extract - Read data from CSV file
+            METRICS.read(file, len(df))
+
+            # Step 2: Transform - Remove duplicate records
+            # Keep the first occurrence when duplicate product_ids are found
+            before = len(df)
+            df = df.drop_duplicates(subset=['product_id'], keep='first')
+            df = df[~df['product_id'].isin(seen_ids)]
+            seen_ids.update(df['product_id'])
+            METRICS.dup(file, before - len(df))
+
+            # Step 3: Transform - Standardize category names
+            # Convert to Title Case: "electronics" -> "Electronics", "FASHION" -> "Fashion"
+            # Each distinct category is converted once and mapped back onto all rows
+            categories = df['category'].astype('category')
+            df['category'] = categories.map({c: c.title() for c in categories.cat.categories})
+
+            # Step 4: Transform - Handle missing stock quantities
+            # Fill missing stock with 0 (default value)
+            null_stock = df['stock_quantity'].isna().sum()
+            df['stock_quantity'] = df['stock_quantity'].fillna(0)
+            METRICS.filled(file, null_stock)
+
+            # Step 5: Transform - Handle missing prices
+            # Price is a required field, so drop records with missing prices
+            # (We don't guess prices as per business rule)
+            before = len(df)
+            df = df.dropna(subset=['price'])
+            METRICS.dropped(file, "missing_price", before - len(df))
+
+            # Step 6: Load - Insert data into database
+            product_ids = df['product_id'].tolist()
+            
+            # Wait for the previous chunk before queuing this one,
+            # so at most one chunk is waiting to be written
+            if pending is not None:
+                loaded = pending.result()
+                id_map.update(loaded)
+                METRICS.loaded(file, len(loaded))
+            
+            if use_load_data:
+                pending = writer.submit(load_data_with_ids, cur, 'products', 'product_id', product_ids, df[columns])
+                continue
+            
+            # Build insert tuples up front so they can be sent in batches
+            # Convert NaN values to None for database compatibility
+            rows = to_db_rows(df, columns)
+            pending = writer.submit(insert_with_ids, cur, 'products', 'product_id', insert_query, product_ids, rows)
+
+        if pending is not None:
+            loaded = pending.result()
+            id_map.update(loaded)
+            METRICS.loaded(file, len(loaded))
 
-    # Save all changes to database
-    conn.commit()
     cur.close()
-    conn.close()
     return id_map
 
 # ==============================
 # 3. SALES DATA PROCESSING (ORDERS + ORDER ITEMS)
 # ==============================
-def process_sales(cust_map, prod_map):
+def process_sales(conn, cust_map, prod_map):
     """
     Extract, transform, and load sales data from CSV file.
     
@@ -522,19 +1020,36 @@ def process_sales(cust_map, prod_map):
     2. Remove duplicate records
     3. Map old customer/product IDs to new database IDs
     4. Drop orphan records (sales with invalid customer/product references)
-    5. Standardize transaction dates
+    5. Standardize transaction dates and drop records missing quantity or price
     6. Group transactions into orders and order items
     7. Load data into database
     
     Args:
+        conn: Database connection prepared with start_bulk_load()
         cust_map: Dictionary mapping old customer IDs to new database IDs
         prod_map: Dictionary mapping old product IDs to new database IDs
     """
-    file = "../data/sales_raw.csv"
+    file = SALES_FILE
     print(f"Processing {file}...")
     
     # Step 1: Extract - Read data from CSV file
-    df = pd.read_csv(file)
+    # Explicit dtypes skip pandas' type inference; status is kept because
+    # duplicate detection compares all columns
+    # Text columns are stored in Arrow buffers so .str operations run in C++
+    df = pd.read_csv(
+        file,
+        usecols=['transaction_id', 'customer_id', 'product_id', 'quantity', 'unit_price', 'transaction_date', 'status'],
+        dtype={
+            'transaction_id': 'string[pyarrow]',
+            'customer_id': 'string[pyarrow]',
+            'product_id': 'string[pyarrow]',
+            'quantity': 'Int32',
+            'unit_price': 'float64',
+            'transaction_date': 'string[pyarrow]',
+            'status': 'string[pyarrow]'
+        },
+        memory_map=True
+    )
     METRICS.read(file, len(df))
 
     # Step 2: Transform - Remove duplicate records
@@ -543,20 +1058,23 @@ def process_sales(cust_map, prod_map):
     df = df.drop_duplicates()
     METRICS.dup(file, before - len(df))
 
-    # Step 3: Transform - Map old IDs to new database IDs
-    # Convert CSV customer IDs (e.g., 'C001') to database customer IDs (e.g., 1)
-    df['db_customer_id'] = df['customer_id'].map(cust_map)
-    # Convert CSV product IDs (e.g., 'P001') to database product IDs (e.g., 1)
-    df['db_product_id'] = df['product_id'].map(prod_map)
-
-    # Step 4: Transform - Handle orphan records
-    # Drop sales records where customer or product was not found/loaded
+    # Step 3 & 4: Transform - Map old IDs to new database IDs and drop orphan records
+    # Inner joins against the ID mappings convert CSV IDs (e.g., 'C001', 'P001')
+    # to database IDs (e.g., 1) and, in the same pass, drop sales records where
+    # the customer or product was not found/loaded
     # (These are called "orphan" records because they reference non-existent data)
-    orphans = df[df['db_customer_id'].isna() | df['db_product_id'].isna()]
-    METRICS.dropped(file, "orphan_record_missing_parent", len(orphans))
+    cust_ids = pd.DataFrame({
+        'customer_id': list(cust_map.keys()),
+        'db_customer_id': list(cust_map.values())
+    })
+    prod_ids = pd.DataFrame({
+        'product_id': list(prod_map.keys()),
+        'db_product_id': list(prod_map.values())
+    })
     
     # Keep only valid sales records (with valid customer and product references)
-    valid_sales = df.dropna(subset=['db_customer_id', 'db_product_id']).copy()
+    valid_sales = df.merge(cust_ids, on='customer_id').merge(prod_ids, on='product_id')
+    METRICS.dropped(file, "orphan_record_missing_parent", len(df) - len(valid_sales))
 
     # Step 5: Transform - Standardize transaction dates using robust multi-format parsing
     # IMPORTANT: order_date is NOT NULL in schema, so records with invalid dates MUST be dropped
@@ -564,75 +1082,101 @@ def process_sales(cust_map, prod_map):
     # Using robust clean_date_series function to minimize data loss by trying multiple formats
     date_series = clean_date_series(valid_sales['transaction_date'])
     
-    # Convert date objects to YYYY-MM-DD strings for database storage
-    # Python date objects convert to YYYY-MM-DD format when converted to string
-    valid_sales['transaction_date'] = date_series.apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None)
+    # Convert dates to YYYY-MM-DD strings for database storage (vectorized)
+    valid_sales['transaction_date'] = date_series.dt.strftime('%Y-%m-%d').astype(object).where(date_series.notna(), None)
     
-    # Check if any dates failed to parse after all format attempts
-    failed_dates = valid_sales['transaction_date'].isna().sum()
+    # Drop records with invalid/missing transaction dates (order_date is NOT NULL constraint)
+    # and check if any dates failed to parse after all format attempts
+    before = len(valid_sales)
+    valid_sales = valid_sales.dropna(subset=['transaction_date'])
+    failed_dates = before - len(valid_sales)
     if failed_dates > 0:
-        print(f"⚠️ Warning: {failed_dates} transaction dates could not be parsed and will be dropped.")
+        print(f"⚠️ Warning: {failed_dates} transaction dates could not be parsed and were dropped.")
         METRICS.dropped(file, "invalid_transaction_date", failed_dates)
-        # Drop records with invalid/missing transaction dates (order_date is NOT NULL constraint)
-        valid_sales = valid_sales[valid_sales['transaction_date'].notna()].copy()
 
-    # Step 6: Load - Insert data into database
-    conn = get_connection()
-    cur = conn.cursor()
+    # quantity and unit_price are NOT NULL in order_items: drop records missing
+    # either one so they are reported here, rather than failing the load's
+    # warning check or counting as 0 in the order total
+    before = len(valid_sales)
+    valid_sales = valid_sales.dropna(subset=['quantity', 'unit_price'])
+    missing_values = before - len(valid_sales)
+    if missing_values > 0:
+        METRICS.dropped(file, "missing_quantity_or_price", missing_values)
+
+    # Step 6: Transform - Group transactions into orders and order items
+    # Records without a transaction_id cannot be grouped into an order, so drop
+    # them here; otherwise their items would have no order_id
+    before = len(valid_sales)
+    valid_sales = valid_sales.dropna(subset=['transaction_id'])
+    missing_transactions = before - len(valid_sales)
+    if missing_transactions > 0:
+        METRICS.dropped(file, "missing_transaction_id", missing_transactions)
     
-    # Group sales by transaction_id to create orders
-    # Each transaction becomes one order with multiple order items
-    grouped = valid_sales.groupby('transaction_id')
+    # Calculate subtotal for every item in one vectorized pass
+    # Money values are rounded to cents to match the DECIMAL(10,2) columns;
+    # float products such as 3 * 0.1 would otherwise be written with extra digits
+    valid_sales['subtotal'] = (valid_sales['quantity'] * valid_sales['unit_price']).round(2)
+    
+    # Each transaction becomes one order; order-level information is the same
+    # for all items in a transaction, and the total is the sum of all items
+    # Note: order_date is guaranteed to be valid (not None) because we dropped
+    # all records with invalid dates in Step 5 above (order_date is NOT NULL in schema)
+    orders = valid_sales.groupby('transaction_id').agg(
+        customer_id=('db_customer_id', 'first'),
+        order_date=('transaction_date', 'first'),
+        total_amount=('subtotal', 'sum')
+    )
     
-    items_loaded = 0
+    orders['total_amount'] = orders['total_amount'].round(2)
+    orders['status'] = 'Completed'
+    
+    # Step 7: Load - Insert data into database
+    cur = conn.cursor()
 
-    # Process each transaction/order
-    for trans_id, group in grouped:
-        # Get order-level information (same for all items in this transaction)
-        customer_id = group.iloc[0]['db_customer_id']
-        order_date = group.iloc[0]['transaction_date']
-        
-        # Calculate total amount for this order (sum of all items)
-        total_amt = (group['quantity'] * group['unit_price']).sum()
-
-        # Insert order record (one per transaction)
-        # Note: order_date is guaranteed to be valid (not None) because we dropped
-        # all records with invalid dates in Step 5 above (order_date is NOT NULL in schema)
-        cur.execute("""
-            INSERT INTO orders (customer_id, order_date, total_amount, status)
-            VALUES (%s, %s, %s, 'Completed')
-        """, (int(customer_id), order_date, float(total_amt)))
-        
-        # Get the auto-generated order ID
-        new_order_id = cur.lastrowid
-
-        # Prepare order items (one per product in this transaction)
-        item_rows = []
-        for _, row in group.iterrows():
-            # Calculate subtotal for this item
-            subtotal = row['quantity'] * row['unit_price']
-            item_rows.append((
-                new_order_id,                    # Link to the order
-                int(row['db_product_id']),      # Product ID
-                int(row['quantity']),            # Quantity purchased
-                float(row['unit_price']),        # Price per unit
-                float(subtotal)                  # Total for this item
-            ))
-
-        # Insert each order item into database
-        for item_row in item_rows:
-            cur.execute("""
+    # Orders and order items have no unique keys besides their generated IDs,
+    # so they are bulk loaded with LOAD DATA LOCAL INFILE whenever the server
+    # allows it, even into non-empty tables; new order IDs are read back above
+    # the previous MAX(order_id). Otherwise they use batched INSERTs.
+    # load_data_infile fails the load on any server warning, so rows are never
+    # silently coerced before finish_bulk_load commits.
+    use_load_data = local_infile_enabled(cur)
+
+    # Insert order records (one per transaction)
+    if use_load_data:
+        order_id_map = load_data_with_ids(cur, 'orders', 'order_id', list(orders.index), orders)
+    else:
+        order_rows = to_db_rows(orders, ['customer_id', 'order_date', 'total_amount', 'status'])
+        order_ids = []
+        for batch in batched(order_rows):
+            order_ids.extend(insert_batch(cur, 'orders', 'order_id', """
+                INSERT INTO orders (customer_id, order_date, total_amount, status)
+                VALUES (%s, %s, %s, %s)
+            """, batch))
+        order_id_map = dict(zip(orders.index, order_ids))
+
+    # Link each item to the auto-generated ID of its order
+    valid_sales['order_id'] = valid_sales['transaction_id'].map(order_id_map)
+    
+    # Prepare order items (one per product in each transaction), grouped by order
+    items = valid_sales.sort_values('transaction_id', kind='stable')
+    items = items[['order_id', 'db_product_id', 'quantity', 'unit_price', 'subtotal']]
+    items = items.rename(columns={'db_product_id': 'product_id'})
+
+    if use_load_data:
+        load_data_infile(cur, 'order_items', items)
+    else:
+        # Insert order items in batches
+        item_rows = to_db_rows(items, list(items.columns))
+        for batch in batched(item_rows):
+            cur.executemany("""
                 INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal)
                 VALUES (%s, %s, %s, %s, %s)
-            """, item_row)
-        
-        items_loaded += len(item_rows)
+            """, batch)
+    
+    items_loaded = len(items)
 
-    # Save all changes to database
-    conn.commit()
     METRICS.loaded(file, items_loaded)
     cur.close()
-    conn.close()
 
 # ==============================
 # REPORT GENERATION
@@ -705,18 +1249,26 @@ if __name__ == "__main__":
     
     Execution order:
     1. Create database schema (creates database and tables if they don't exist)
-    2. Process customers first (creates customer ID mapping)
-    3. Process products second (creates product ID mapping)
+    2. Process products while customer data is cleaned on a worker thread
+       (creates product ID mapping)
+    3. Load customers (creates customer ID mapping)
     4. Process sales last (uses customer and product mappings)
-    5. Generate and save data quality report
+    5. Verify foreign keys and commit the load
+    6. Generate and save data quality report
     
     Note: The order matters because sales records need valid customer
     and product references, which are created in steps 2 and 3.
+    
+    All tables are loaded on one connection in a single transaction, so the
+    foreign key check sees every loaded row and a failed check rolls back
+    the whole load. Only the customer CSV read and cleaning, which does not
+    touch the database, runs concurrently with the product load.
     """
     
     # Step 0: Create database schema (must run before ETL process)
     # This ensures all tables exist before attempting to insert data
-    create_database_schema()
+    conn = get_connection(use_database=False)
+    create_database_schema(conn)
     
     # Optional: Clear all tables before running (uncomment to reset database)
     # This is useful for testing, but should be commented out in production
@@ -726,17 +1278,29 @@ if __name__ == "__main__":
     # conn.commit()
     # conn.close()
 
-    # Step 1: Process customers
-    # Returns a dictionary mapping old customer IDs to new database IDs
-    cust_map = process_customers()
+    # Load all tables in one bulk transaction with foreign key checks switched off
+    start_bulk_load(conn)
 
-    # Step 2: Process products
-    # Returns a dictionary mapping old product IDs to new database IDs
-    prod_map = process_products()
+    # Register the files in report order; customers and products record
+    # their metrics from different threads below
+    for file in (CUSTOMERS_FILE, PRODUCTS_FILE, SALES_FILE):
+        METRICS.register(file)
+
+    # Step 1 & 2: Clean customers on a worker thread while products are
+    # processed on the shared connection, then load the customers
+    # Each mapping is a dictionary from old IDs to new database IDs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        customers_future = executor.submit(clean_customers)
+        prod_map = process_products(conn)
+        cust_map = load_customers(conn, customers_future.result())
 
     # Step 3: Process sales
     # Uses the customer and product mappings to link sales to valid records
-    process_sales(cust_map, prod_map)
+    process_sales(conn, cust_map, prod_map)
+    
+    # Verify referential integrity once and commit everything
+    finish_bulk_load(conn)
+    conn.close()
     
     # Step 4: Generate and save the data quality report
     generate_report()
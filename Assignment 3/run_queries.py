@@ -4,7 +4,13 @@ Script to run and display results of business queries
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.pooling import MySQLConnectionPool
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from itertools import starmap
 import os
+import sys
+import threading
 from getpass import getpass
 
 # Database configuration
@@ -24,79 +30,175 @@ def get_db_config():
         "port": int(os.getenv('MYSQL_PORT', '3306'))
     }
 
-DB_CONFIG = get_db_config()
+# The configuration and connection pool are created on the first
+# get_connection() call rather than at import, so importing this module never
+# prompts for a password. The lock makes sure concurrent callers prompt once.
+_DB_CONFIG = None
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+# Rows are fetched from the server in batches of FETCH_SIZE; each query
+# buffers at most QUEUE_BATCHES batches while it waits to be printed
+FETCH_SIZE = 1000
+QUEUE_BATCHES = 4
+
+# Column widths are taken from the first batch but never exceed this, so one
+# long value does not stretch the whole table
+MAX_COLUMN_WIDTH = 60
 
 def get_connection():
-    """Create and return a connection to the MySQL database."""
-    return mysql.connector.connect(**DB_CONFIG)
+    """
+    Return a connection to the MySQL database from the connection pool.
+    Calling close() on it returns it to the pool.
+    
+    Connections are opened once and reused; pool_size covers one connection
+    per concurrently running query.
+    """
+    global _DB_CONFIG, _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            if _DB_CONFIG is None:
+                _DB_CONFIG = get_db_config()
+            _POOL = MySQLConnectionPool(pool_name="fleximart", pool_size=4, pool_reset_session=False, **_DB_CONFIG)
+    return _POOL.get_connection()
 
-def run_query(query_name, query_sql):
-    """Execute a query and display results."""
+def run_query(query_name, query_sql, output):
+    """
+    Execute a query on its own connection and stream its results.
+    
+    Each call checks out a separate pooled connection, so queries can run
+    concurrently from different threads (connections and cursors are not
+    thread-safe). The query is sent as a server-side prepared statement
+    (binary protocol) on an unbuffered cursor. Rows are read in batches of
+    FETCH_SIZE and put on the `output` queue as ("columns", names),
+    ("rows", batch) and ("error", e) messages, followed by ("done", None).
+    The queue is bounded, so a query waiting to be printed holds at most
+    a few batches in memory.
+    """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        print(f"\n{'='*80}")
-        print(f"{query_name}")
-        print(f"{'='*80}")
-        
-        cursor.execute(query_sql)
-        results = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        
-        if not results:
-            print("No results found.")
-        else:
-            # Print column headers
-            print("\n" + " | ".join(f"{col:20}" for col in columns))
-            print("-" * 80)
-            
-            # Print rows
-            for row in results:
-                print(" | ".join(f"{str(val):20}" for val in row))
+        try:
+            cursor = conn.cursor(prepared=True, buffered=False)
+            cursor.execute(query_sql, ())
+            output.put(("columns", [desc[0] for desc in cursor.description]))
             
-            print(f"\nTotal rows: {len(results)}")
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                output.put(("rows", rows))
+            cursor.close()
+        finally:
+            conn.close()
+    except Error as e:
+        output.put(("error", e))
+    finally:
+        output.put(("done", None))
+
+def print_results(output):
+    """Display the results of a query as they are streamed in by run_query."""
+    columns = []
+    format_row = None
+    total_rows = 0
+    
+    while True:
+        kind, value = output.get()
+        if kind == "done":
+            break
+        if kind == "error":
+            print(f"Error executing query: {value}")
+            return
+        if kind == "columns":
+            columns = value
+            continue
         
-        cursor.close()
-        conn.close()
+        if total_rows == 0:
+            # Size each column from its header and the first batch, and build
+            # the row template once for all batches
+            widths = [
+                min(max(len(col), max(map(len, map(str, values)))), MAX_COLUMN_WIDTH)
+                for col, values in zip(columns, zip(*value))
+            ]
+            # !s applies str() inside format(), so each row is formatted by a
+            # single call with no per-cell Python code
+            fmt = " | ".join(f"{{!s:{width}}}" for width in widths)
+            format_row = fmt.format
+            
+            # Print column headers
+            header = fmt.format(*columns)
+            print("\n" + header)
+            print("-" * len(header))
         
-    except Error as e:
-        print(f"Error executing query: {e}")
+        # Print rows, one write per fetched batch
+        sys.stdout.write("\n".join(starmap(format_row, value)) + "\n")
+        total_rows += len(value)
+    
+    if total_rows == 0:
+        print("No results found.")
+    else:
+        print(f"\nTotal rows: {total_rows}")
 
 # Query 1: Customer Purchase History
 query1 = """
+WITH order_spend AS (
+    SELECT
+        order_id,
+        SUM(subtotal) AS order_total
+    FROM 
+        order_items
+    GROUP BY 
+        order_id
+),
+cust_agg AS (
+    SELECT
+        o.customer_id,
+        COUNT(*) AS total_orders,
+        SUM(os.order_total) AS total_spent
+    FROM 
+        orders o
+        INNER JOIN order_spend os ON o.order_id = os.order_id
+    GROUP BY 
+        o.customer_id
+    HAVING 
+        COUNT(*) >= 2 
+        AND SUM(os.order_total) > 5000
+)
 SELECT 
     CONCAT(c.first_name, ' ', c.last_name) AS customer_name,
     c.email,
-    COUNT(DISTINCT o.order_id) AS total_orders,
-    SUM(oi.subtotal) AS total_spent
+    ca.total_orders,
+    ca.total_spent
 FROM 
-    customers c
-    INNER JOIN orders o ON c.customer_id = o.customer_id
-    INNER JOIN order_items oi ON o.order_id = oi.order_id
-GROUP BY 
-    c.customer_id, c.first_name, c.last_name, c.email
-HAVING 
-    COUNT(DISTINCT o.order_id) >= 2 
-    AND SUM(oi.subtotal) > 5000
+    cust_agg ca
+    INNER JOIN customers c ON c.customer_id = ca.customer_id
 ORDER BY 
-    total_spent DESC;
+    ca.total_spent DESC;
 """
 
 # Query 2: Product Sales Analysis
 query2 = """
+WITH product_sales AS (
+    SELECT
+        product_id,
+        SUM(quantity) AS quantity_sold,
+        SUM(subtotal) AS revenue
+    FROM 
+        order_items
+    GROUP BY 
+        product_id
+)
 SELECT 
     p.category,
-    COUNT(DISTINCT p.product_id) AS num_products,
-    SUM(oi.quantity) AS total_quantity_sold,
-    SUM(oi.subtotal) AS total_revenue
+    COUNT(*) AS num_products,
+    SUM(ps.quantity_sold) AS total_quantity_sold,
+    SUM(ps.revenue) AS total_revenue
 FROM 
-    products p
-    INNER JOIN order_items oi ON p.product_id = oi.product_id
+    product_sales ps
+    INNER JOIN products p ON p.product_id = ps.product_id
 GROUP BY 
     p.category
 HAVING 
-    SUM(oi.subtotal) > 10000
+    SUM(ps.revenue) > 10000
 ORDER BY 
     total_revenue DESC;
 """
@@ -104,37 +206,56 @@ ORDER BY
 # Query 3: Monthly Sales Trend
 query3 = """
 SELECT 
-    month_name,
-    total_orders,
-    monthly_revenue,
-    SUM(monthly_revenue) OVER (
-        ORDER BY month_num
+    MONTHNAME(MIN(o.order_date)) AS month_name,
+    COUNT(DISTINCT o.order_id) AS total_orders,
+    SUM(o.total_amount) AS monthly_revenue,
+    SUM(SUM(o.total_amount)) OVER (
+        ORDER BY MONTH(o.order_date)
         ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
     ) AS cumulative_revenue
-FROM (
-    SELECT
-        MONTHNAME(o.order_date) AS month_name,
-        MONTH(o.order_date) AS month_num,
-        COUNT(DISTINCT o.order_id) AS total_orders,
-        SUM(o.total_amount) AS monthly_revenue
-    FROM 
-        orders o
-    WHERE 
-        YEAR(o.order_date) = 2024
-    GROUP BY 
-        MONTH(o.order_date), MONTHNAME(o.order_date)
-) AS monthly_data
+FROM 
+    orders o
+WHERE 
+    o.order_date >= '2024-01-01'
+    AND o.order_date < '2025-01-01'
+GROUP BY 
+    MONTH(o.order_date)
 ORDER BY 
-    month_num;
+    MONTH(o.order_date);
 """
 
 if __name__ == "__main__":
+    # Prompt for the password (if needed) and open the pool up front, so the
+    # prompt is not mixed into query output from the worker threads.
+    # A connection error is reported per query below, as each one retries.
+    try:
+        get_connection().close()
+    except Error:
+        pass
+    
     print("Running Business Queries for FlexiMart Database")
     print("=" * 80)
     
-    run_query("Query 1: Customer Purchase History", query1)
-    run_query("Query 2: Product Sales Analysis", query2)
-    run_query("Query 3: Monthly Sales Trend", query3)
+    queries = [
+        ("Query 1: Customer Purchase History", query1),
+        ("Query 2: Product Sales Analysis", query2),
+        ("Query 3: Monthly Sales Trend", query3),
+    ]
+    
+    # The queries are independent, so run them concurrently and print the
+    # results in submission order as each one streams in
+    outputs = [Queue(maxsize=QUEUE_BATCHES) for _ in queries]
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = [executor.submit(run_query, name, sql, output)
+                   for (name, sql), output in zip(queries, outputs)]
+        
+        for (query_name, _), output, future in zip(queries, outputs, futures):
+            print(f"\n{'='*80}")
+            print(f"{query_name}")
+            print(f"{'='*80}")
+            
+            print_results(output)
+            future.result()
     
     print("\n" + "="*80)
     print("All queries completed!")